@@ -0,0 +1,100 @@
+import json
+from starlette.responses import Response
+
+# Optional fast encoders. orjson (or msgspec) is used for JSON when installed,
+# otherwise we fall back to a compact stdlib json.dumps. MessagePack is only
+# offered to clients when msgspec or msgpack is available.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+JSON_MEDIA_TYPE = "application/json"
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+# Older clients still ask for the unregistered x- variant.
+MSGPACK_MEDIA_TYPES = (MSGPACK_MEDIA_TYPE, "application/x-msgpack", "application/vnd.msgpack")
+
+if orjson is not None:
+    def dumps_json(content):
+        return orjson.dumps(content)
+elif msgspec is not None:
+    _msgspec_json_encoder = msgspec.json.Encoder()
+
+    def dumps_json(content):
+        return _msgspec_json_encoder.encode(content)
+else:
+    def dumps_json(content):
+        return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+if msgspec is not None:
+    _msgspec_msgpack_encoder = msgspec.msgpack.Encoder()
+
+    def dumps_msgpack(content):
+        return _msgspec_msgpack_encoder.encode(content)
+elif msgpack is not None:
+    def dumps_msgpack(content):
+        return msgpack.packb(content, use_bin_type=True)
+else:
+    dumps_msgpack = None
+
+class FastJSONResponse(Response):
+    """
+    JSON response that serializes the content directly with the fastest
+    available encoder. The content must already be JSON-compatible
+    (dicts, lists, str, int, float, bool, None).
+    """
+    media_type = JSON_MEDIA_TYPE
+
+    def render(self, content) -> bytes:
+        return dumps_json(content)
+
+class MsgPackResponse(Response):
+    """Compact binary response, sent when the client asks for MessagePack."""
+    media_type = MSGPACK_MEDIA_TYPE
+
+    def render(self, content) -> bytes:
+        if dumps_msgpack is None:
+            raise RuntimeError("MessagePack support requires 'msgspec' or 'msgpack' to be installed.")
+        return dumps_msgpack(content)
+
+def wants_msgpack(accept_header):
+    """
+    Returns True if the Accept header prefers MessagePack over JSON.
+    Only the explicitly listed types are considered; '*/*' keeps JSON.
+    """
+    if not accept_header or dumps_msgpack is None:
+        return False
+
+    best_type, best_q = None, 0.0
+    for part in accept_header.split(","):
+        media_type, _, params = part.strip().partition(";")
+        media_type = media_type.strip().lower()
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if media_type in MSGPACK_MEDIA_TYPES or media_type == JSON_MEDIA_TYPE:
+            # Ties go to whichever type the client listed first.
+            if q > best_q:
+                best_type, best_q = media_type, q
+    return best_type in MSGPACK_MEDIA_TYPES
+
+def negotiate_response(accept_header, content, status_code=200):
+    """Builds a MessagePack or JSON response based on the request's Accept header."""
+    if wants_msgpack(accept_header):
+        return MsgPackResponse(content, status_code=status_code)
+    return FastJSONResponse(content, status_code=status_code)
@@ -0,0 +1,49 @@
+from typing import List, Literal, Optional
+from pydantic import BaseModel
+
+# Typed request/response models for the API.
+# Requests are validated once by FastAPI when they arrive. Responses are
+# declared here so they show up in the OpenAPI docs, but the endpoints return
+# pre-rendered Response objects (see api/responses.py) so FastAPI skips its
+# generic jsonable_encoder pass on the hot path.
+
+class GenerateRequest(BaseModel):
+    """Body of a POST /api/v1/generate request."""
+    prompt: str = ""
+    max_tokens: Optional[int] = None
+    temperature: Optional[float] = None
+    top_p: Optional[float] = None
+    # Streaming is not implemented, so 'stream: true' fails validation (HTTP 422)
+    stream: Optional[Literal[False]] = None
+
+    def as_params(self):
+        """
+        Returns the parameters that were actually set as a plain dict, so
+        ModelLoader falls back to its configured defaults for the rest.
+        """
+        if hasattr(self, 'model_dump'):
+            return self.model_dump(exclude_none=True)  # pydantic v2
+        return self.dict(exclude_none=True)  # pydantic v1
+
+class CompletionChoice(BaseModel):
+    text: str
+    index: int = 0
+    logprobs: Optional[dict] = None
+    finish_reason: Optional[str] = None
+
+class CompletionUsage(BaseModel):
+    prompt_tokens: int
+    completion_tokens: int
+    total_tokens: int
+
+class CompletionResponse(BaseModel):
+    """Body of a successful POST /api/v1/generate response."""
+    choices: List[CompletionChoice]
+    usage: CompletionUsage
+
+class HealthResponse(BaseModel):
+    status: str
+    model_loaded: bool
+
+class ErrorResponse(BaseModel):
+    error: str
@@ -0,0 +1,79 @@
+import argparse
+import json
+import os
+import sys
+import timeit
+
+# Allow running as 'python benchmarks/bench_serialization.py' from the project root.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from api.responses import FastJSONResponse, MsgPackResponse, dumps_msgpack
+
+def make_payload(completion_chars):
+    """Builds a completion response shaped exactly like ModelLoader.create_completion's output."""
+    return {
+        "choices": [{
+            "text": ("lorem ipsum " * (completion_chars // 12 + 1))[:completion_chars],
+            "index": 0,
+            "logprobs": None,
+            "finish_reason": "length"
+        }],
+        "usage": {
+            "prompt_tokens": 12,
+            "completion_tokens": max(1, completion_chars // 4),
+            "total_tokens": 12 + max(1, completion_chars // 4)
+        }
+    }
+
+def default_path(payload):
+    """What FastAPI does for a plain dict return value: jsonable_encoder, then JSONResponse."""
+    return JSONResponse(jsonable_encoder(payload)).body
+
+def fast_json_path(payload):
+    return FastJSONResponse(payload).body
+
+def msgpack_path(payload):
+    return MsgPackResponse(payload).body
+
+def run_benchmark(completion_chars, number, repeat):
+    payload = make_payload(completion_chars)
+    paths = [("default", default_path), ("fast_json", fast_json_path)]
+    if dumps_msgpack is not None:
+        paths.append(("msgpack", msgpack_path))
+
+    results = {"completion_chars": completion_chars, "number": number, "paths": {}}
+    for name, func in paths:
+        best = min(timeit.repeat(lambda: func(payload), number=number, repeat=repeat))
+        results["paths"][name] = {
+            "us_per_request": round(best / number * 1e6, 3),
+            "bytes": len(func(payload))
+        }
+
+    baseline = results["paths"]["default"]["us_per_request"]
+    for entry in results["paths"].values():
+        entry["speedup"] = round(baseline / entry["us_per_request"], 2) if entry["us_per_request"] else None
+    return results
+
+if __name__ == '__main__':
+    # Compares the per-request serialization cost of the default FastAPI
+    # response path against the FastJSONResponse and MessagePack paths.
+    # Run from the project root: python benchmarks/bench_serialization.py
+    parser = argparse.ArgumentParser(
+        description="Micro-benchmark of per-request response serialization cost."
+    )
+    parser.add_argument(
+        '--sizes',
+        type=int,
+        nargs='+',
+        default=[64, 512, 4096],
+        help="Completion text lengths (in characters) to benchmark. Defaults to 64 512 4096."
+    )
+    parser.add_argument('--number', type=int, default=5000, help="Calls per timing run.")
+    parser.add_argument('--repeat', type=int, default=5, help="Timing runs per path; the best is reported.")
+
+    args = parser.parse_args()
+
+    report = [run_benchmark(size, args.number, args.repeat) for size in args.sizes]
+    print(json.dumps(report, indent=2))
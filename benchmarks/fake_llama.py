@@ -0,0 +1,55 @@
+import functools
+import time
+
+class FakeLlama:
+    """
+    Deterministic stand-in for llama_cpp.Llama.
+
+    Accepts the same constructor keyword arguments as ModelLoader passes to
+    Llama and returns completions shaped like Llama.__call__, sleeping a fixed
+    amount per prompt and completion token instead of running a model. The
+    server's scheduling and HTTP overhead can then be benchmarked without a
+    GGUF file or a GPU.
+    """
+    def __init__(self, model_path=None, n_ctx=2048, token_latency=0.005, prompt_token_latency=0.0002,
+                 block_count=32, **kwargs):
+        self.model_path = model_path
+        self.n_ctx = n_ctx
+        self.token_latency = token_latency
+        self.prompt_token_latency = prompt_token_latency
+        self.metadata = {"llama.block_count": str(block_count)}
+
+    @staticmethod
+    def count_tokens(text):
+        # Roughly four characters per token, close enough for English prompts.
+        return max(1, len(text) // 4)
+
+    def __call__(self, prompt, max_tokens=16, temperature=0.8, top_p=0.95, stop=None, echo=False, **kwargs):
+        prompt_tokens = self.count_tokens(prompt)
+        if max_tokens is None or max_tokens <= 0:
+            max_tokens = max(1, self.n_ctx - prompt_tokens)
+        completion_tokens = max(1, min(max_tokens, self.n_ctx - prompt_tokens))
+
+        time.sleep(prompt_tokens * self.prompt_token_latency + completion_tokens * self.token_latency)
+
+        return {
+            "id": "cmpl-fake",
+            "object": "text_completion",
+            "created": int(time.time()),
+            "model": self.model_path or "fake-llama",
+            "choices": [{
+                "text": " tok" * completion_tokens,
+                "index": 0,
+                "logprobs": None,
+                "finish_reason": "length"
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens
+            }
+        }
+
+def fake_llama_factory(**options):
+    """Returns a model_factory for ModelLoader that builds FakeLlama with the given options."""
+    return functools.partial(FakeLlama, **options)
@@ -0,0 +1,361 @@
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+# Allow running as 'python benchmarks/load_test.py' from the project root.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.regression import check_against_baseline, load_report
+
+GENERATE_PATH = "/api/v1/generate"
+
+class HTTPConnection:
+    """
+    Minimal keep-alive HTTP/1.1 client on asyncio streams.
+    Avoids extra dependencies and reports when the first response byte
+    arrives, which is what the TTFT numbers are based on.
+    """
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.reader = None
+        self.writer = None
+
+    async def post_json(self, path, body):
+        """Sends a POST and returns (status, first_byte_time, response_body)."""
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+
+        head = (
+            f"POST {path} HTTP/1.1\r\n"
+            f"Host: {self.host}:{self.port}\r\n"
+            "Content-Type: application/json\r\n"
+            "Accept: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            "\r\n"
+        ).encode("ascii")
+        self.writer.write(head + body)
+        await self.writer.drain()
+
+        status_line = await self.reader.readline()
+        first_byte_time = time.perf_counter()
+        if not status_line:
+            raise ConnectionError("Server closed the connection.")
+        status = int(status_line.split()[1])
+
+        headers = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size = int((await self.reader.readline()).split(b";")[0], 16)
+                if size == 0:
+                    await self.reader.readline()
+                    break
+                chunks.append(await self.reader.readexactly(size))
+                await self.reader.readexactly(2)
+            response_body = b"".join(chunks)
+        else:
+            response_body = await self.reader.readexactly(int(headers.get("content-length", 0)))
+
+        if headers.get("connection", "").lower() == "close":
+            await self.close()
+        return status, first_byte_time, response_body
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except Exception:
+                pass
+        self.reader = self.writer = None
+
+def sample_prompt_lengths(count, dist, mean, sigma, rng):
+    """Returns 'count' prompt lengths (in tokens) drawn from the chosen distribution."""
+    if dist == "fixed":
+        return [mean] * count
+    if dist == "uniform":
+        low, high = max(1, mean - mean // 2), mean + mean // 2
+        return [rng.randint(low, high) for _ in range(count)]
+    if dist == "lognormal":
+        # Parameterised so the distribution's mean is 'mean' tokens
+        mu = math.log(mean) - sigma ** 2 / 2
+        return [max(1, round(rng.lognormvariate(mu, sigma))) for _ in range(count)]
+    raise ValueError(f"Unknown prompt length distribution: {dist}")
+
+def build_payloads(args, count, rng):
+    payloads = []
+    for length in sample_prompt_lengths(count, args.prompt_dist, args.prompt_tokens, args.prompt_sigma, rng):
+        # "tok " is four characters, which FakeLlama counts as one token
+        payloads.append(json.dumps({
+            "prompt": "tok " * length,
+            "max_tokens": args.max_tokens,
+            "temperature": 0.0
+        }).encode("utf-8"))
+    return payloads
+
+async def send_request(conn, payload, scheduled_at, results):
+    """
+    Sends one request and records its timings. Latency and TTFT are measured
+    from the scheduled send time, so time spent waiting for a free connection
+    under an open-loop arrival model is included.
+    """
+    record = {"ok": False, "tokens": 0}
+    try:
+        status, first_byte_time, body = await conn.post_json(GENERATE_PATH, payload)
+        end = time.perf_counter()
+        record["latency"] = end - scheduled_at
+        record["ttft"] = first_byte_time - scheduled_at
+        if status == 200:
+            data = json.loads(body)
+            if "error" not in data:
+                record["ok"] = True
+                record["tokens"] = data["usage"]["completion_tokens"]
+    except Exception as e:
+        record["error"] = str(e)
+        await conn.close()
+    results.append(record)
+
+async def run_closed_loop(host, port, payloads, concurrency):
+    """'concurrency' clients each send their next request as soon as the previous one returns."""
+    results = []
+    pending = list(reversed(payloads))
+
+    async def client():
+        conn = HTTPConnection(host, port)
+        while pending:
+            payload = pending.pop()
+            await send_request(conn, payload, time.perf_counter(), results)
+        await conn.close()
+
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    return results
+
+async def run_poisson(host, port, payloads, concurrency, rate, rng):
+    """
+    Open-loop arrivals with exponential inter-arrival times (mean 1/rate).
+    At most 'concurrency' requests are in flight; later arrivals wait for a
+    connection and that wait counts towards their latency.
+    """
+    results = []
+    pool = asyncio.Queue()
+    for _ in range(concurrency):
+        pool.put_nowait(HTTPConnection(host, port))
+
+    async def dispatch(payload, scheduled_at):
+        conn = await pool.get()
+        try:
+            await send_request(conn, payload, scheduled_at, results)
+        finally:
+            pool.put_nowait(conn)
+
+    tasks = []
+    next_arrival = time.perf_counter()
+    for payload in payloads:
+        next_arrival += rng.expovariate(rate)
+        delay = next_arrival - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.ensure_future(dispatch(payload, next_arrival)))
+    await asyncio.gather(*tasks)
+
+    while not pool.empty():
+        await pool.get_nowait().close()
+    return results
+
+def percentiles(values):
+    if not values:
+        return None
+    values = sorted(values)
+
+    def pick(fraction):
+        return round(values[min(len(values) - 1, int(round(fraction * (len(values) - 1))))] * 1000, 3)
+
+    return {
+        "mean": round(sum(values) / len(values) * 1000, 3),
+        "p50": pick(0.50),
+        "p90": pick(0.90),
+        "p95": pick(0.95),
+        "p99": pick(0.99),
+        "max": round(values[-1] * 1000, 3)
+    }
+
+def build_report(args, results, duration):
+    ok = [r for r in results if r["ok"]]
+    return {
+        "config": {
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "arrival": args.arrival,
+            "rate": args.rate if args.arrival == "poisson" else None,
+            "prompt_dist": args.prompt_dist,
+            "prompt_tokens": args.prompt_tokens,
+            "prompt_sigma": args.prompt_sigma if args.prompt_dist == "lognormal" else None,
+            "max_tokens": args.max_tokens,
+            "fake_server": args.fake_server,
+            "token_latency": args.token_latency if args.fake_server else None,
+            "prompt_token_latency": args.prompt_token_latency if args.fake_server else None,
+            "seed": args.seed
+        },
+        "requests": len(results),
+        "errors": len(results) - len(ok),
+        "error_rate": round((len(results) - len(ok)) / len(results), 4) if results else 0.0,
+        "duration_s": round(duration, 3),
+        "throughput_rps": round(len(ok) / duration, 3) if duration else 0.0,
+        "tokens_per_second": round(sum(r["tokens"] for r in ok) / duration, 3) if duration else 0.0,
+        # Times are in milliseconds. The generate endpoint is not streamed, so
+        # TTFT is time to the first response byte and tracks latency closely.
+        "latency": percentiles([r["latency"] for r in ok]),
+        "ttft": percentiles([r["ttft"] for r in ok])
+    }
+
+async def run_load(args):
+    rng = random.Random(args.seed)
+    if args.warmup:
+        await run_closed_loop(args.host, args.port, build_payloads(args, args.warmup, rng), 1)
+
+    payloads = build_payloads(args, args.requests, rng)
+    start = time.perf_counter()
+    if args.arrival == "poisson":
+        results = await run_poisson(args.host, args.port, payloads, args.concurrency, args.rate, rng)
+    else:
+        results = await run_closed_loop(args.host, args.port, payloads, args.concurrency)
+    return build_report(args, results, time.perf_counter() - start)
+
+def start_fake_server(host, port, token_latency, prompt_token_latency):
+    """
+    Starts the real FastAPI app in a background thread with FakeLlama
+    injected into ModelLoader, so no GGUF model is needed.
+    """
+    import uvicorn
+    from main import AppState, create_app
+    from config.settings import ConfigManager
+    from core.log_pipeline import LogPipeline
+    from core.model_loader import ModelLoader
+    from benchmarks.fake_llama import fake_llama_factory
+
+    with tempfile.NamedTemporaryFile('w', suffix='.ini', delete=False) as f:
+        f.write(f"[server]\nhost = {host}\nport = {port}\n\n[model]\nmodel_path =\n")
+        config_path = f.name
+    try:
+        config_manager = ConfigManager(config_path=config_path)
+    finally:
+        os.remove(config_path)
+
+    app_state = AppState()
+    app_state.config_manager = config_manager
+    app_state.log_pipeline = LogPipeline(log_file=None, level="WARNING")
+    app_state.model_loader = ModelLoader(
+        config_manager,
+        app_state.log_pipeline.log,
+        model_factory=fake_llama_factory(token_latency=token_latency, prompt_token_latency=prompt_token_latency)
+    )
+    app_state.is_model_loaded = True
+
+    server = uvicorn.Server(uvicorn.Config(create_app(app_state), host=host, port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+
+    deadline = time.time() + 10
+    while not server.started:
+        if not thread.is_alive() or time.time() > deadline:
+            raise RuntimeError(f"Fake server failed to start on {host}:{port}.")
+        time.sleep(0.05)
+    return server, thread
+
+def _bounded(convert, minimum, strict):
+    """Builds an argparse type that rejects values below 'minimum' (or equal to it if strict)."""
+    def parse(text):
+        try:
+            value = convert(text)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"invalid {convert.__name__} value: {text!r}")
+        if value < minimum or (strict and value == minimum):
+            raise argparse.ArgumentTypeError(f"must be {'>' if strict else '>='} {minimum}, got {text}")
+        return value
+    return parse
+
+positive_int = _bounded(int, 0, strict=True)
+non_negative_int = _bounded(int, 0, strict=False)
+positive_float = _bounded(float, 0, strict=True)
+non_negative_float = _bounded(float, 0, strict=False)
+
+if __name__ == '__main__':
+    # Examples (from the project root):
+    #   python benchmarks/load_test.py --fake-server --concurrency 8 --requests 500
+    #   python benchmarks/load_test.py --arrival poisson --rate 20 --prompt-dist lognormal
+    #   python benchmarks/load_test.py --fake-server --baseline benchmarks/baseline.json
+    # The report is printed as JSON; with --baseline the script exits with
+    # status 1 if any tracked metric regressed beyond --tolerance, or 2 if the
+    # baseline was recorded with different load test settings.
+    parser = argparse.ArgumentParser(
+        description="Async load generator and regression benchmark for the LLM API server."
+    )
+    parser.add_argument('--host', default='127.0.0.1', help="Server host. Defaults to 127.0.0.1.")
+    parser.add_argument('--port', type=int, default=8000, help="Server port. Defaults to 8000.")
+    parser.add_argument('--requests', type=positive_int, default=200, help="Number of measured requests.")
+    parser.add_argument('--warmup', type=non_negative_int, default=5, help="Unmeasured requests sent first.")
+    parser.add_argument('--concurrency', type=positive_int, default=4, help="Maximum requests in flight.")
+    parser.add_argument('--arrival', choices=['closed', 'poisson'], default='closed',
+                        help="'closed': clients send back-to-back. 'poisson': open-loop arrivals at --rate.")
+    parser.add_argument('--rate', type=positive_float, default=10.0, help="Mean arrivals per second for --arrival poisson.")
+    parser.add_argument('--prompt-dist', choices=['fixed', 'uniform', 'lognormal'], default='fixed',
+                        help="Prompt length distribution.")
+    parser.add_argument('--prompt-tokens', type=positive_int, default=32, help="Mean prompt length in tokens.")
+    parser.add_argument('--prompt-sigma', type=non_negative_float, default=0.5, help="Sigma for --prompt-dist lognormal.")
+    parser.add_argument('--max-tokens', type=positive_int, default=16, help="max_tokens sent with each request.")
+    parser.add_argument('--seed', type=int, default=0, help="Random seed for arrivals and prompt lengths.")
+    parser.add_argument('--fake-server', action='store_true',
+                        help="Start the server in-process with FakeLlama instead of using a running one.")
+    parser.add_argument('--token-latency', type=non_negative_float, default=0.002, help="FakeLlama seconds per completion token.")
+    parser.add_argument('--prompt-token-latency', type=non_negative_float, default=0.0001, help="FakeLlama seconds per prompt token.")
+    parser.add_argument('--output', help="Also write the JSON report to this file.")
+    parser.add_argument('--save-baseline', help="Write the report to this file for future comparisons.")
+    parser.add_argument('--baseline', help="Compare the report against this baseline file.")
+    parser.add_argument('--tolerance', type=non_negative_float, default=0.10, help="Allowed relative slowdown vs. baseline. Defaults to 0.10.")
+    parser.add_argument('--allow-config-mismatch', action='store_true',
+                        help="Compare against --baseline even if it was recorded with different settings.")
+
+    args = parser.parse_args()
+
+    server = thread = None
+    if args.fake_server:
+        server, thread = start_fake_server(args.host, args.port, args.token_latency, args.prompt_token_latency)
+    try:
+        report = asyncio.run(run_load(args))
+    finally:
+        if server is not None:
+            server.should_exit = True
+            thread.join(timeout=10)
+
+    exit_code = 0
+    if args.baseline:
+        comparison, exit_code = check_against_baseline(
+            report, load_report(args.baseline), args.tolerance, args.allow_config_mismatch
+        )
+        report.update(comparison)
+        if exit_code == 2:
+            print("Refusing to compare: load test settings differ from the baseline "
+                  "(see config_mismatches, or pass --allow-config-mismatch).", file=sys.stderr)
+
+    output = json.dumps(report, indent=2)
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(output + "\n")
+    print(output)
+    sys.exit(exit_code)
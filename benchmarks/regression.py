@@ -0,0 +1,117 @@
+import argparse
+import json
+import sys
+
+# Metrics compared against the baseline, and whether a larger value is better.
+TRACKED_METRICS = {
+    "throughput_rps": True,
+    "tokens_per_second": True,
+    "latency.p50": False,
+    "latency.p95": False,
+    "latency.p99": False,
+    "ttft.p50": False,
+    "ttft.p95": False,
+    "error_rate": False,
+}
+
+# Load test settings that must match for two reports to be comparable.
+# 'requests' and 'seed' only change the sample, not what is being measured.
+COMPARABLE_CONFIG_KEYS = (
+    "concurrency",
+    "arrival",
+    "rate",
+    "prompt_dist",
+    "prompt_tokens",
+    "prompt_sigma",
+    "max_tokens",
+    "token_latency",
+    "prompt_token_latency",
+)
+
+def config_mismatches(current, baseline):
+    """
+    Returns the load test settings that differ between two reports, as
+    {"key", "baseline", "current"} dicts. A report without a 'config' block
+    mismatches on every key.
+    """
+    current_config = current.get("config") or {}
+    baseline_config = baseline.get("config") or {}
+    mismatches = []
+    for key in COMPARABLE_CONFIG_KEYS:
+        if key not in current_config or key not in baseline_config or current_config[key] != baseline_config[key]:
+            mismatches.append({"key": key, "baseline": baseline_config.get(key), "current": current_config.get(key)})
+    return mismatches
+
+def check_against_baseline(current, baseline, tolerance=0.10, allow_config_mismatch=False):
+    """
+    Compares a report against a baseline, refusing when their load test
+    settings differ. Returns (result, exit_code): exit_code is 0 when nothing
+    regressed, 1 on a regression and 2 if the comparison was refused.
+    """
+    result = {"config_mismatches": config_mismatches(current, baseline)}
+    if result["config_mismatches"] and not allow_config_mismatch:
+        result["regressions"] = None
+        return result, 2
+    result["regressions"] = compare_reports(current, baseline, tolerance)
+    return result, 1 if any(f["regression"] for f in result["regressions"]) else 0
+
+def get_metric(report, dotted_key):
+    value = report
+    for part in dotted_key.split("."):
+        if not isinstance(value, dict) or part not in value:
+            return None
+        value = value[part]
+    return value
+
+def compare_reports(current, baseline, tolerance=0.10):
+    """
+    Compares a load test report against a baseline report.
+    Returns a list of findings; a finding is a regression when the metric got
+    worse by more than 'tolerance' (a fraction, 0.10 = 10%).
+    """
+    findings = []
+    for key, higher_is_better in TRACKED_METRICS.items():
+        new, old = get_metric(current, key), get_metric(baseline, key)
+        if new is None or old is None:
+            continue
+        if old == 0:
+            change = 0.0 if new == 0 else float("inf")
+        else:
+            change = (new - old) / old
+        worse_by = -change if higher_is_better else change
+        findings.append({
+            "metric": key,
+            "baseline": old,
+            "current": new,
+            "change": round(change, 4) if change != float("inf") else None,
+            "regression": worse_by > tolerance
+        })
+    return findings
+
+def load_report(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+if __name__ == '__main__':
+    # Usage: python benchmarks/regression.py current.json baseline.json --tolerance 0.1
+    # Exits with status 1 if any tracked metric regressed, or 2 if the reports
+    # were recorded with different load test settings.
+    parser = argparse.ArgumentParser(
+        description="Compare a load test report against a stored baseline."
+    )
+    parser.add_argument('current', help="Report produced by benchmarks/load_test.py.")
+    parser.add_argument('baseline', help="Baseline report to compare against.")
+    parser.add_argument('--tolerance', type=float, default=0.10, help="Allowed relative slowdown. Defaults to 0.10 (10%%).")
+    parser.add_argument('--allow-config-mismatch', action='store_true',
+                        help="Compare even if the reports were recorded with different load test settings.")
+
+    args = parser.parse_args()
+
+    result, exit_code = check_against_baseline(
+        load_report(args.current), load_report(args.baseline), args.tolerance, args.allow_config_mismatch
+    )
+    if exit_code == 2:
+        print("Refusing to compare: load test settings differ from the baseline "
+              "(see config_mismatches, or pass --allow-config-mismatch).", file=sys.stderr)
+    print(json.dumps(result, indent=2))
+    sys.exit(exit_code)
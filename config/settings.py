@@ -13,6 +13,9 @@ class ServerConfig:
         self.api_keys = [key.strip() for key in config.get('api_keys', '').split(',') if key]
         self.log_level = config.get('log_level', 'INFO')
         self.log_file = config.get('log_file', 'llm_server.log')
+        self.log_max_bytes = config.getint('log_max_bytes', 10 * 1024 * 1024)
+        self.log_backup_count = config.getint('log_backup_count', 3)
+        self.log_buffer_size = config.getint('log_buffer_size', 10000)
         self.use_auth = config.getboolean('use_auth', False)
         self.batch_size = config.getint('batch_size', 4)
 
@@ -0,0 +1,157 @@
+import collections
+import json
+import os
+import threading
+import time
+
+LEVELS = {"DEBUG": 10, "INFO": 20, "WARNING": 30, "ERROR": 40, "CRITICAL": 50}
+
+class LogPipeline:
+    """
+    Non-blocking structured logger.
+
+    log() only filters by level and appends a record to a bounded ring buffer,
+    so it is safe to call from request handlers. A background thread drains the
+    buffer in batches and appends them as JSON lines to the log file, rotating
+    it once it grows past max_bytes. If the writer falls behind, the oldest
+    buffered records are dropped and counted instead of blocking the caller.
+
+    The GUI does not receive every record; it polls tail_since() for the last
+    few formatted lines.
+    """
+    def __init__(self, log_file=None, level="INFO", capacity=10000, batch_size=256,
+                 flush_interval=0.5, max_bytes=10 * 1024 * 1024, backup_count=3, tail_size=500):
+        self.log_file = log_file
+        self.level = LEVELS.get(str(level).upper(), LEVELS["INFO"])
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+
+        self._buffer = collections.deque(maxlen=capacity)
+        self._tail = collections.deque(maxlen=tail_size)
+        self._seq = 0
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+
+        self.written = 0
+        self.dropped = 0
+        self.filtered = 0
+        self.write_errors = 0
+
+        self._file = None
+        self._writer = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._writer.start()
+
+    def is_enabled_for(self, level):
+        return LEVELS.get(level, LEVELS["INFO"]) >= self.level
+
+    def log(self, message, level="INFO", **fields):
+        """Queues a record without blocking. Extra keyword arguments become JSON fields."""
+        if not self.is_enabled_for(level):
+            with self._lock:
+                self.filtered += 1
+            return
+
+        now = time.time()
+        record = {"ts": now, "level": level, "msg": str(message)}
+        if fields:
+            record.update(fields)
+        line = f"[{time.strftime('%H:%M:%S', time.localtime(now))}] {message}"
+
+        with self._lock:
+            if len(self._buffer) == self._buffer.maxlen:
+                self.dropped += 1  # deque(maxlen) evicts the oldest record
+            self._buffer.append(record)
+            self._seq += 1
+            self._tail.append((self._seq, line))
+            if len(self._buffer) >= self.batch_size:
+                self._wakeup.set()
+
+    def tail_since(self, seq):
+        """
+        Returns (last_seq, lines) for tail lines newer than seq.
+        Lines older than the tail window are skipped rather than replayed.
+        """
+        with self._lock:
+            if seq >= self._seq:
+                return self._seq, []
+            return self._seq, [line for line_seq, line in self._tail if line_seq > seq]
+
+    def stats(self):
+        with self._lock:
+            return {
+                "pending": len(self._buffer),
+                "written": self.written,
+                "dropped": self.dropped,
+                "filtered": self.filtered,
+                "write_errors": self.write_errors
+            }
+
+    def close(self, timeout=2.0):
+        """Stops the writer thread after flushing whatever is still buffered."""
+        self._stopped.set()
+        self._wakeup.set()
+        self._writer.join(timeout)
+
+    def _run(self):
+        while not self._stopped.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self._flush()
+        self._flush()
+        if self._file:
+            self._file.close()
+            self._file = None
+
+    def _take_batch(self):
+        with self._lock:
+            count = min(len(self._buffer), self.batch_size)
+            return [self._buffer.popleft() for _ in range(count)]
+
+    def _flush(self):
+        while True:
+            batch = self._take_batch()
+            if not batch:
+                return
+            if not self.log_file:
+                self._count(written=len(batch))
+                continue
+            # Logging must never take the server down; count failures and move on.
+            try:
+                data = "".join(json.dumps(record, default=str) + "\n" for record in batch)
+                if self._file is None:
+                    self._file = open(self.log_file, "a", encoding="utf-8")
+                self._file.write(data)
+                self._file.flush()
+            except Exception:
+                self._count(write_errors=1, dropped=len(batch))
+                continue
+            self._count(written=len(batch))
+
+            # The batch is already on disk, so a failed rotation is not a drop
+            try:
+                if self.max_bytes and self._file.tell() >= self.max_bytes:
+                    self._rotate()
+            except Exception:
+                self._count(write_errors=1)
+
+    def _count(self, written=0, dropped=0, write_errors=0):
+        with self._lock:
+            self.written += written
+            self.dropped += dropped
+            self.write_errors += write_errors
+
+    def _rotate(self):
+        """Shifts log_file -> log_file.1 -> ... -> log_file.<backup_count>."""
+        self._file.close()
+        self._file = None
+        if self.backup_count > 0:
+            for i in range(self.backup_count - 1, 0, -1):
+                src = f"{self.log_file}.{i}"
+                if os.path.exists(src):
+                    os.replace(src, f"{self.log_file}.{i + 1}")
+            os.replace(self.log_file, f"{self.log_file}.1")
+        else:
+            open(self.log_file, "w").close()
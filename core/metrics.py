@@ -0,0 +1,139 @@
+import collections
+import os
+import threading
+import time
+
+try:
+    import psutil
+    _process = psutil.Process()
+except ImportError:
+    psutil = None
+
+def get_process_rss():
+    """Returns the resident set size of this process in bytes, or None if it can't be read."""
+    if psutil is not None:
+        return _process.memory_info().rss
+    try:
+        # Linux fallback: second field of statm is resident pages.
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError, IndexError):
+        return None
+
+class RequestTracker:
+    """Tracks a single request from arrival (queued) through generation (active) to completion."""
+    def __init__(self, metrics):
+        self.metrics = metrics
+        self.start_time = time.perf_counter()
+        self.is_active = False
+        self.is_finished = False
+
+    def started(self):
+        """Call once the request has the model and generation begins."""
+        self.metrics._move_to_active(self)
+
+    def finished(self, completion_tokens=0, error=False):
+        """Records the outcome. Only the first call counts; later calls are ignored."""
+        self.metrics._record_finished(self, time.perf_counter() - self.start_time, completion_tokens, error)
+
+class ServerMetrics:
+    """
+    Thread-safe, fixed-size performance counters.
+
+    Recording is O(1) and snapshot() works on bounded windows, so sampling
+    cost stays the same regardless of traffic volume. Token rate and latency
+    percentiles both cover the last 'window_seconds'; latency additionally
+    keeps at most 'latency_samples' of the most recent requests.
+    """
+    def __init__(self, window_seconds=10, latency_samples=1000):
+        self.window_seconds = window_seconds
+        self._lock = threading.Lock()
+        self.queued = 0
+        self.active = 0
+        self.total_requests = 0
+        self.total_errors = 0
+        self.total_tokens = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        # One [second, tokens] bucket per monotonic second over the rate window
+        self._token_buckets = collections.deque(maxlen=window_seconds)
+        # (monotonic time, latency) pairs
+        self._latencies = collections.deque(maxlen=latency_samples)
+
+    def track_request(self):
+        """Registers a newly arrived request as queued and returns its tracker."""
+        with self._lock:
+            self.queued += 1
+        return RequestTracker(self)
+
+    def record_cache(self, hit):
+        """Hook for cache layers (e.g. a prompt cache) to report lookups."""
+        with self._lock:
+            if hit:
+                self.cache_hits += 1
+            else:
+                self.cache_misses += 1
+
+    def _move_to_active(self, tracker):
+        with self._lock:
+            # A cancelled request can still reach the model later in its
+            # worker thread; it has already been counted as finished.
+            if tracker.is_active or tracker.is_finished:
+                return
+            tracker.is_active = True
+            self.queued -= 1
+            self.active += 1
+
+    def _record_finished(self, tracker, latency, completion_tokens, error):
+        now = time.monotonic()
+        second = int(now)
+        with self._lock:
+            if tracker.is_finished:
+                return
+            tracker.is_finished = True
+            if tracker.is_active:
+                self.active -= 1
+            else:
+                self.queued -= 1
+            self.total_requests += 1
+            if error:
+                self.total_errors += 1
+                return
+            self.total_tokens += completion_tokens
+            self._latencies.append((now, latency))
+            if self._token_buckets and self._token_buckets[-1][0] == second:
+                self._token_buckets[-1][1] += completion_tokens
+            else:
+                self._token_buckets.append([second, completion_tokens])
+
+    def snapshot(self):
+        """Returns a dict of the current metrics. Cheap enough to call from the GUI thread."""
+        now = time.monotonic()
+        with self._lock:
+            # Drop samples that have aged out so percentiles go blank when traffic stops
+            while self._latencies and self._latencies[0][0] <= now - self.window_seconds:
+                self._latencies.popleft()
+            latencies = [latency for _, latency in self._latencies]
+            window_tokens = sum(tokens for second, tokens in self._token_buckets if second > int(now) - self.window_seconds)
+            cache_lookups = self.cache_hits + self.cache_misses
+            snapshot = {
+                "queued": self.queued,
+                "active": self.active,
+                "total_requests": self.total_requests,
+                "total_errors": self.total_errors,
+                "total_tokens": self.total_tokens,
+                "cache_hit_rate": self.cache_hits / cache_lookups if cache_lookups else None
+            }
+
+        latencies.sort()
+        snapshot["tokens_per_second"] = window_tokens / self.window_seconds
+        snapshot["latency_p50"] = _percentile(latencies, 0.50)
+        snapshot["latency_p95"] = _percentile(latencies, 0.95)
+        snapshot["rss_bytes"] = get_process_rss()
+        return snapshot
+
+def _percentile(sorted_values, fraction):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
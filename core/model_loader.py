@@ -1,14 +1,34 @@
-from llama_cpp import Llama
 import os
+import threading
+
+try:
+    from llama_cpp import Llama
+except ImportError:
+    # Allows the server to be benchmarked with an injected model_factory
+    # (see benchmarks/fake_llama.py) on machines without llama-cpp-python.
+    Llama = None
 
 class ModelLoader:
     """Handles the loading of the Llama.cpp model and text generation."""
-    def __init__(self, config_manager, logger_func):
+    def __init__(self, config_manager, logger_func, model_factory=None):
+        """
+        'model_factory' is called with the same keyword arguments as
+        llama_cpp.Llama and defaults to it. Pass a stand-in (e.g. FakeLlama)
+        to run the server without a GGUF model.
+        """
         self.config = config_manager.model_config
         self.logger = logger_func
+        self.model_factory = model_factory
+        # llama.cpp contexts are not thread-safe; callers running completions
+        # from worker threads must hold this lock around create_completion().
+        self.lock = threading.Lock()
         
-        if not self.config.model_path or not os.path.exists(self.config.model_path):
-            raise FileNotFoundError(f"Model path is invalid or not set. Please select a valid model file. Path: '{self.config.model_path}'")
+        if self.model_factory is None:
+            if Llama is None:
+                raise ImportError("llama-cpp-python is not installed. Install it with 'pip install llama-cpp-python'.")
+            if not self.config.model_path or not os.path.exists(self.config.model_path):
+                raise FileNotFoundError(f"Model path is invalid or not set. Please select a valid model file. Path: '{self.config.model_path}'")
+            self.model_factory = Llama
             
         self.model = self._load_model()
 
@@ -19,7 +39,7 @@ class ModelLoader:
         self.logger(f"GPU Layers: {self.config.n_gpu_layers}")
         
         try:
-            llm = Llama(
+            llm = self.model_factory(
                 model_path=self.config.model_path,
                 lora_path=self.config.lora_path if self.config.lora_path else None,
                 n_ctx=self.config.max_tokens,
@@ -29,7 +49,7 @@ class ModelLoader:
             )
             return llm
         except Exception as e:
-            self.logger(f"Fatal error during model loading: {e}")
+            self.logger(f"Fatal error during model loading: {e}", level="ERROR")
             raise
     
     def get_layer_count(self):
@@ -48,8 +68,10 @@ class ModelLoader:
         """
         Reliably gets the model's layer count by initializing it minimally
         and reading the metadata dictionary provided by llama-cpp-python.
+        Returns None if the count isn't available; errors reading the model
+        are raised so the caller can log them.
         """
-        if not model_path or not os.path.exists(model_path):
+        if Llama is None or not model_path or not os.path.exists(model_path):
             return None
         
         llm = None
@@ -63,9 +85,6 @@ class ModelLoader:
                     if key.endswith('.block_count'):
                         return int(value)
             return None
-        except Exception as e:
-            print(f"Error reading model metadata: {e}")
-            return None
         finally:
             # Ensure the temporary model object is released
             if llm:
@@ -89,7 +108,7 @@ class ModelLoader:
         if stream:
             return {"error": "Streaming is not implemented in this synchronous endpoint."}
 
-        self.logger(f"Creating completion for prompt: '{prompt[:50]}...'")
+        self.logger(f"Creating completion for prompt: '{prompt[:50]}...'", level="DEBUG")
         
         output = self.model(
             prompt,
@@ -100,7 +119,7 @@ class ModelLoader:
             echo=False
         )
 
-        self.logger("Completion generated successfully.")
+        self.logger("Completion generated successfully.", level="DEBUG")
         
         return {
             "choices": [{
@@ -2,18 +2,21 @@ import tkinter as tk
 from tkinter import ttk, scrolledtext, messagebox, filedialog
 import queue
 import threading
-import time
 import sys
 import os
 
 class ControlPanelGUI(tk.Tk):
     """The main GUI for the application, built with Tkinter."""
+    MAX_LOG_LINES = 500 # The log view only keeps a trimmed tail; the full log is in the log file
+    METRICS_INTERVAL_MS = 1000 # How often the performance panel samples the metrics snapshot
+
     def __init__(self, app_state, server_start_func):
         super().__init__()
         self.app_state = app_state
         self.server_start_func = server_start_func
         self.server_thread = None
-        self.ui_queue = queue.Queue() # Queue for UI updates from other threads
+        self.ui_queue = queue.Queue() # Queue for control messages (not logs) from other threads
+        self.log_seq = 0 # Last log pipeline sequence number shown in the log view
 
         self.title("LLM API Control Panel")
         self.geometry("900x700")
@@ -24,6 +27,7 @@ class ControlPanelGUI(tk.Tk):
         self.create_widgets()
         
         self.after(100, self.process_ui_queue)
+        self.after(self.METRICS_INTERVAL_MS, self.refresh_metrics)
         self.protocol("WM_DELETE_WINDOW", self.on_closing)
         
         # Initial check for model layers if path is valid
@@ -35,7 +39,7 @@ class ControlPanelGUI(tk.Tk):
         """Create and layout all the GUI widgets in a more organized fashion."""
         main_frame = ttk.Frame(self, padding="10")
         main_frame.pack(fill=tk.BOTH, expand=True)
-        main_frame.rowconfigure(1, weight=1)
+        main_frame.rowconfigure(2, weight=1)
         main_frame.columnconfigure(0, weight=1)
 
         controls_frame = ttk.Frame(main_frame)
@@ -85,14 +89,73 @@ class ControlPanelGUI(tk.Tk):
         self.unload_model_button = ttk.Button(button_frame, text="Unload Model", command=self.unload_model, state=tk.DISABLED)
         self.unload_model_button.pack(side=tk.LEFT, padx=5)
 
+        self.create_metrics_panel(main_frame)
+
         log_frame = ttk.LabelFrame(main_frame, text="Application Logs", padding="10")
-        log_frame.grid(row=1, column=0, sticky="nsew", pady=5)
+        log_frame.grid(row=2, column=0, sticky="nsew", pady=5)
         log_frame.rowconfigure(0, weight=1)
         log_frame.columnconfigure(0, weight=1)
 
         self.log_text = scrolledtext.ScrolledText(log_frame, state='disabled', wrap=tk.WORD, bg="#2b2b2b", fg="white", font=("Consolas", 10))
         self.log_text.grid(row=0, column=0, sticky="nsew")
 
+    def create_metrics_panel(self, parent):
+        """
+        Creates a fixed grid of metric labels. Refreshing only updates the
+        label text, so rendering cost does not depend on request volume.
+        """
+        metrics_group = ttk.LabelFrame(parent, text="Performance", padding="10")
+        metrics_group.grid(row=1, column=0, sticky="ew", pady=5)
+
+        fields = [
+            ('tokens_per_second', "Tokens/s:"),
+            ('queued', "Queue Depth:"),
+            ('active', "Active Requests:"),
+            ('latency_p50', "Latency p50:"),
+            ('latency_p95', "Latency p95:"),
+            ('cache_hit_rate', "Cache Hit Rate:"),
+            ('rss_bytes', "Process RSS:"),
+            ('total_requests', "Total Requests:"),
+            ('total_errors', "Errors:"),
+            ('log_dropped', "Log Drops:"),
+        ]
+        columns = 5
+        self.metric_vars = {}
+        for i, (key, label) in enumerate(fields):
+            row, col = divmod(i, columns)
+            metrics_group.columnconfigure(col * 2 + 1, weight=1)
+            ttk.Label(metrics_group, text=label).grid(row=row, column=col * 2, sticky="w", padx=(5, 2))
+            self.metric_vars[key] = tk.StringVar(value="-")
+            ttk.Label(metrics_group, textvariable=self.metric_vars[key], width=10).grid(row=row, column=col * 2 + 1, sticky="w")
+
+    def refresh_metrics(self):
+        """Samples the metrics snapshot and updates the performance panel."""
+        try:
+            snapshot = self.app_state.metrics.snapshot()
+            snapshot['log_dropped'] = self.app_state.log_pipeline.stats()['dropped']
+
+            def fmt_latency(seconds):
+                return "-" if seconds is None else f"{seconds * 1000:.0f} ms"
+
+            values = {
+                'tokens_per_second': f"{snapshot['tokens_per_second']:.1f}",
+                'queued': str(snapshot['queued']),
+                'active': str(snapshot['active']),
+                'latency_p50': fmt_latency(snapshot['latency_p50']),
+                'latency_p95': fmt_latency(snapshot['latency_p95']),
+                'cache_hit_rate': "n/a" if snapshot['cache_hit_rate'] is None else f"{snapshot['cache_hit_rate']:.0%}",
+                'rss_bytes': "n/a" if snapshot['rss_bytes'] is None else f"{snapshot['rss_bytes'] / (1024 * 1024):.0f} MB",
+                'total_requests': str(snapshot['total_requests']),
+                'total_errors': str(snapshot['total_errors']),
+                'log_dropped': str(snapshot['log_dropped']),
+            }
+            for key, value in values.items():
+                # Skip unchanged values to avoid needless redraws
+                if self.metric_vars[key].get() != value:
+                    self.metric_vars[key].set(value)
+        finally:
+            self.after(self.METRICS_INTERVAL_MS, self.refresh_metrics)
+
     def on_gpu_slider_change(self, value):
         """Handles the GPU layer slider value change."""
         layers = int(float(value))
@@ -121,7 +184,7 @@ class ControlPanelGUI(tk.Tk):
                 # Start a thread to detect the model's layers
                 threading.Thread(target=self.detect_model_layers, args=(filepath,), daemon=True).start()
             except Exception as e:
-                self.log(f"Error saving new model path: {e}")
+                self.log(f"Error saving new model path: {e}", level="ERROR")
                 messagebox.showerror("Error", f"Could not save new model path to config file.\n{e}")
 
     def detect_model_layers(self, model_path):
@@ -131,25 +194,35 @@ class ControlPanelGUI(tk.Tk):
             if max_layers is not None:
                 self.ui_queue.put(('update_slider', max_layers))
             else:
-                self.log("Could not determine model layer count from GGUF metadata.")
+                self.log("Could not determine model layer count from GGUF metadata.", level="WARNING")
         except Exception as e:
-            self.log(f"Failed to detect model layers: {e}")
+            self.log(f"Failed to detect model layers: {e}", level="ERROR")
+
+    def log(self, message, level="INFO"):
+        self.app_state.log_pipeline.log(message, level=level)
 
-    def log(self, message):
-        self.ui_queue.put(('log', f"[{time.strftime('%H:%M:%S')}] {message}"))
+    def process_log_tail(self):
+        """Appends new lines from the log pipeline's tail and trims the view to MAX_LOG_LINES."""
+        self.log_seq, lines = self.app_state.log_pipeline.tail_since(self.log_seq)
+        if not lines:
+            return
+        lines = lines[-self.MAX_LOG_LINES:]
+        self.log_text.config(state='normal')
+        self.log_text.insert(tk.END, '\n'.join(lines) + '\n')
+        line_count = int(self.log_text.index('end-1c').split('.')[0]) - 1
+        if line_count > self.MAX_LOG_LINES:
+            self.log_text.delete('1.0', f"{line_count - self.MAX_LOG_LINES + 1}.0")
+        self.log_text.config(state='disabled')
+        self.log_text.see(tk.END)
 
     def process_ui_queue(self):
         try:
+            self.process_log_tail()
             while True:
                 msg_type, data = self.ui_queue.get_nowait()
-                if msg_type == 'log':
-                    if "Server has stopped" in data:
-                        self.start_server_button.config(state=tk.NORMAL)
-                        self.stop_server_button.config(state=tk.DISABLED)
-                    self.log_text.config(state='normal')
-                    self.log_text.insert(tk.END, data + '\n')
-                    self.log_text.config(state='disabled')
-                    self.log_text.see(tk.END)
+                if msg_type == 'server_stopped':
+                    self.start_server_button.config(state=tk.NORMAL)
+                    self.stop_server_button.config(state=tk.DISABLED)
                 elif msg_type == 'update_slider':
                     max_layers = data
                     self.log(f"Detected {max_layers} layers in model. Updating slider.")
@@ -182,7 +255,7 @@ class ControlPanelGUI(tk.Tk):
             self.app_state.server_instance.should_exit = True
             self.stop_server_button.config(state=tk.DISABLED)
         else:
-            self.log("Server instance not found. Cannot stop.")
+            self.log("Server instance not found. Cannot stop.", level="WARNING")
 
     def load_model(self):
         self.log("Model loading process started...")
@@ -200,7 +273,7 @@ class ControlPanelGUI(tk.Tk):
                 if max_layers:
                     self.ui_queue.put(('update_slider', max_layers))
             except Exception as e:
-                self.log(f"❌ Error loading model: {e}")
+                self.log(f"❌ Error loading model: {e}", level="ERROR")
                 messagebox.showerror("Model Load Error", f"Failed to load the model. Please check the path and file integrity.\n\nError: {e}")
             finally:
                 if not self.app_state.is_model_loaded:
@@ -223,4 +296,5 @@ class ControlPanelGUI(tk.Tk):
             if self.app_state.server_instance:
                 self.app_state.server_instance.should_exit = True
             self.destroy()
+            self.app_state.log_pipeline.close()
             sys.exit(0)
\ No newline at end of file
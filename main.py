@@ -1,13 +1,15 @@
-import tkinter as tk
 import uvicorn
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.concurrency import run_in_threadpool
 import threading
-import queue
 import sys
 import os
-from gui.control_panel import ControlPanelGUI
 from config.settings import ConfigManager, ConfigError
+from core.log_pipeline import LogPipeline
+from core.metrics import ServerMetrics
+from api.schemas import GenerateRequest, CompletionResponse, HealthResponse, ErrorResponse
+from api.responses import FastJSONResponse, negotiate_response
 
 # Determine the base directory of the running application
 # This makes sure that paths work correctly even when the script is run from another directory.
@@ -20,31 +22,20 @@ class AppState:
         self.model_loader = None
         self.is_model_loaded = False
         self.is_server_running = False
-        self.gui_log_queue = queue.Queue()
+        self.log_pipeline = None # Structured, non-blocking log sink shared by the server and GUI
+        self.metrics = ServerMetrics() # Live performance counters sampled by the GUI
         self.server_instance = None # To hold the Uvicorn server instance
 
-def main():
-    """Main function to initialize and run the application."""
-    app_state = AppState()
-
-    # Initialize configuration using a dynamic path
-    try:
-        config_path = os.path.join(APP_BASE_DIR, 'llm_config.ini')
-        app_state.config_manager = ConfigManager(config_path=config_path)
-    except ConfigError as e:
-        # If config fails, we can't proceed. Show error in a simple Tk window.
-        root = tk.Tk()
-        root.title("Configuration Error")
-        label = tk.Label(root, text=f"Failed to load configuration:\n{e}\n\nPlease fix llm_config.ini and restart.", padx=20, pady=20)
-        label.pack()
-        root.mainloop()
-        sys.exit(1)
-        
-    # --- FastAPI Server Setup ---
+def create_app(app_state):
+    """
+    Builds the FastAPI app around an AppState. Kept separate from main() so
+    the server can be run headless, e.g. by benchmarks/load_test.py.
+    """
     app = FastAPI(
         title="LLM API Server",
         description="An API to serve local LLM models using llama-cpp-python.",
-        version="1.0.0"
+        version="1.0.0",
+        default_response_class=FastJSONResponse
     )
 
     # Add CORS middleware to allow all origins, which is useful for web-based GUIs.
@@ -57,27 +48,96 @@ def main():
         allow_headers=["*"],  # Allows all headers
     )
 
-    @app.post("/api/v1/generate")
-    async def generate(request: dict):
+    def run_completion(model_loader, params, tracker):
+        """
+        Runs a completion in a worker thread so the event loop stays free.
+        Requests wait (queued) for the model lock, then generate one at a time (active).
+        """
+        with model_loader.lock:
+            tracker.started()
+            return model_loader.create_completion(params)
+
+    @app.post(
+        "/api/v1/generate",
+        response_model=CompletionResponse,
+        responses={500: {"model": ErrorResponse}, 503: {"model": ErrorResponse}}
+    )
+    async def generate(body: GenerateRequest, request: Request):
         """
         API endpoint to handle text generation requests.
         It uses the loaded model to create a completion.
+        The response is JSON, or MessagePack if the client sends
+        'Accept: application/msgpack'.
         """
-        if not app_state.is_model_loaded or app_state.model_loader is None:
-            return {"error": "Model is not currently loaded."}, 503
+        accept = request.headers.get("accept")
+        model_loader = app_state.model_loader
+        if not app_state.is_model_loaded or model_loader is None or not model_loader.model:
+            return negotiate_response(accept, {"error": "Model is not currently loaded."}, status_code=503)
+
+        params = body.as_params()
+        if params.get("stream", model_loader.config.streaming):
+            # The request can't ask for streaming, but the configured default can
+            return negotiate_response(accept, {"error": "Streaming is not implemented in this synchronous endpoint."}, status_code=501)
         
+        tracker = app_state.metrics.track_request()
+        completion_tokens, error = 0, True
         try:
             # The actual generation is handled by the model loader
-            response = app_state.model_loader.create_completion(request)
-            return response
+            response = await run_in_threadpool(run_completion, model_loader, params, tracker)
+            if "error" in response:
+                return negotiate_response(accept, response, status_code=500)
+            result = negotiate_response(accept, response)
+            completion_tokens, error = response["usage"].get("completion_tokens", 0), False
+            return result
         except Exception as e:
-            app_state.gui_log_queue.put(f"API Error: {e}")
-            return {"error": f"An error occurred during generation: {e}"}, 500
+            app_state.log_pipeline.log(f"API Error: {e}", level="ERROR")
+            return negotiate_response(accept, {"error": f"An error occurred during generation: {e}"}, status_code=500)
+        finally:
+            # Also runs on cancellation (CancelledError is not an Exception)
+            tracker.finished(completion_tokens=completion_tokens, error=error)
 
-    @app.get("/health")
+    @app.get("/health", response_model=HealthResponse)
     async def health_check():
         """Health check endpoint to verify server status."""
-        return {"status": "ok", "model_loaded": app_state.is_model_loaded}
+        return FastJSONResponse({"status": "ok", "model_loaded": app_state.is_model_loaded})
+
+    return app
+
+def main():
+    """Main function to initialize and run the application."""
+    # Tkinter is imported here so create_app() can be used on machines without a display.
+    import tkinter as tk
+    from gui.control_panel import ControlPanelGUI
+
+    app_state = AppState()
+
+    # Initialize configuration using a dynamic path
+    try:
+        config_path = os.path.join(APP_BASE_DIR, 'llm_config.ini')
+        app_state.config_manager = ConfigManager(config_path=config_path)
+    except ConfigError as e:
+        # If config fails, we can't proceed. Show error in a simple Tk window.
+        root = tk.Tk()
+        root.title("Configuration Error")
+        label = tk.Label(root, text=f"Failed to load configuration:\n{e}\n\nPlease fix llm_config.ini and restart.", padx=20, pady=20)
+        label.pack()
+        root.mainloop()
+        sys.exit(1)
+
+    server_config = app_state.config_manager.server_config
+    log_file = server_config.log_file
+    if log_file and not os.path.isabs(log_file):
+        log_file = os.path.join(APP_BASE_DIR, log_file)
+    app_state.log_pipeline = LogPipeline(
+        log_file=log_file,
+        level=server_config.log_level,
+        capacity=server_config.log_buffer_size,
+        max_bytes=server_config.log_max_bytes,
+        backup_count=server_config.log_backup_count
+    )
+        
+    # --- FastAPI Server Setup ---
+    app = create_app(app_state)
 
     def run_server():
         """Target function to run the Uvicorn server in a separate thread."""
@@ -90,7 +150,9 @@ def main():
         app_state.server_instance.run()
         # After server stops, update state
         app_state.is_server_running = False
-        app_state.gui_log_queue.put("Server has stopped.")
+        app_state.log_pipeline.log("Server has stopped.")
+        # Button state must not depend on the log line, which log_level may filter out
+        gui.ui_queue.put(('server_stopped', None))
 
 
     # --- GUI Setup and Main Loop ---
@@ -0,0 +1,6 @@
+import os
+import sys
+
+# Make the project packages (api, config, core, benchmarks) importable when
+# pytest is run as 'pytest' rather than 'python -m pytest'.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
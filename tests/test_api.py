@@ -0,0 +1,110 @@
+import pytest
+from fastapi.testclient import TestClient
+from main import AppState, create_app
+from config.settings import ConfigManager
+from core.log_pipeline import LogPipeline
+from core.model_loader import ModelLoader
+from benchmarks.fake_llama import FakeLlama, fake_llama_factory
+
+def make_app_state(tmp_path, streaming=False, model_factory=None):
+    config_path = tmp_path / "llm_config.ini"
+    config_path.write_text(f"[server]\n\n[model]\nmodel_path =\nstreaming = {streaming}\n")
+    app_state = AppState()
+    app_state.config_manager = ConfigManager(config_path=str(config_path))
+    app_state.log_pipeline = LogPipeline(log_file=None, flush_interval=60)
+    app_state.model_loader = ModelLoader(
+        app_state.config_manager,
+        app_state.log_pipeline.log,
+        model_factory=model_factory or fake_llama_factory(token_latency=0, prompt_token_latency=0)
+    )
+    app_state.is_model_loaded = True
+    return app_state
+
+@pytest.fixture
+def app_state(tmp_path):
+    state = make_app_state(tmp_path)
+    yield state
+    state.log_pipeline.close()
+
+@pytest.fixture
+def client(app_state):
+    return TestClient(create_app(app_state))
+
+def assert_idle(app_state):
+    snapshot = app_state.metrics.snapshot()
+    assert (snapshot["queued"], snapshot["active"]) == (0, 0)
+    return snapshot
+
+def test_health(client):
+    response = client.get("/health")
+    assert response.status_code == 200
+    assert response.json() == {"status": "ok", "model_loaded": True}
+
+def test_generate_json(client, app_state):
+    response = client.post("/api/v1/generate", json={"prompt": "tok " * 8, "max_tokens": 5})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/json")
+    data = response.json()
+    assert data["choices"][0]["text"] == " tok" * 5
+    assert data["usage"] == {"prompt_tokens": 8, "completion_tokens": 5, "total_tokens": 13}
+
+    snapshot = assert_idle(app_state)
+    assert snapshot["total_requests"] == 1
+    assert snapshot["total_tokens"] == 5
+
+def test_generate_msgpack(client):
+    msgpack = pytest.importorskip("msgpack")
+    body = {"prompt": "tok " * 8, "max_tokens": 5}
+    response = client.post("/api/v1/generate", json=body, headers={"Accept": "application/msgpack"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/msgpack")
+
+    data = msgpack.unpackb(response.content, raw=False)
+    assert data == client.post("/api/v1/generate", json=body).json()
+
+def test_generate_without_model_returns_503(client, app_state):
+    app_state.model_loader = None
+    app_state.is_model_loaded = False
+    response = client.post("/api/v1/generate", json={"prompt": "hi"})
+    assert response.status_code == 503
+    assert "error" in response.json()
+
+@pytest.mark.parametrize("body", [
+    {"prompt": ["not", "a", "string"]},
+    {"prompt": "hi", "max_tokens": "many"},
+    {"prompt": "hi", "stream": True},
+])
+def test_generate_rejects_bad_body(client, app_state, body):
+    response = client.post("/api/v1/generate", json=body)
+    assert response.status_code == 422
+    assert assert_idle(app_state)["total_requests"] == 0
+
+def test_generate_rejects_non_json_body(client):
+    response = client.post("/api/v1/generate", content=b"not json", headers={"Content-Type": "application/json"})
+    assert response.status_code == 422
+
+def test_streaming_default_returns_501(tmp_path):
+    state = make_app_state(tmp_path, streaming=True)
+    try:
+        response = TestClient(create_app(state)).post("/api/v1/generate", json={"prompt": "hi"})
+        assert response.status_code == 501
+        # An explicit 'stream: false' overrides the configured default
+        response = TestClient(create_app(state)).post("/api/v1/generate", json={"prompt": "hi", "stream": False})
+        assert response.status_code == 200
+    finally:
+        state.log_pipeline.close()
+
+class BrokenLlama(FakeLlama):
+    def __call__(self, prompt, **kwargs):
+        raise RuntimeError("boom")
+
+def test_generation_error_returns_500_and_counts_error(tmp_path):
+    state = make_app_state(tmp_path, model_factory=BrokenLlama)
+    try:
+        response = TestClient(create_app(state)).post("/api/v1/generate", json={"prompt": "hi"})
+        assert response.status_code == 500
+        assert "boom" in response.json()["error"]
+        snapshot = assert_idle(state)
+        assert snapshot["total_errors"] == 1
+    finally:
+        state.log_pipeline.close()
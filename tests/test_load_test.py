@@ -0,0 +1,23 @@
+import argparse
+import pytest
+from benchmarks.load_test import non_negative_int, positive_float, positive_int
+
+@pytest.mark.parametrize("parse, text, expected", [
+    (positive_int, "1", 1),
+    (positive_float, "0.5", 0.5),
+    (non_negative_int, "0", 0),
+])
+def test_bounded_types_accept_valid_values(parse, text, expected):
+    assert parse(text) == expected
+
+@pytest.mark.parametrize("parse, text", [
+    (positive_int, "0"),
+    (positive_int, "-3"),
+    (positive_float, "0"),
+    (positive_float, "-1.5"),
+    (positive_float, "abc"),
+    (non_negative_int, "-1"),
+])
+def test_bounded_types_reject_invalid_values(parse, text):
+    with pytest.raises(argparse.ArgumentTypeError):
+        parse(text)
@@ -0,0 +1,116 @@
+import json
+import os
+import pytest
+from core import log_pipeline
+from core.log_pipeline import LogPipeline
+
+def make_pipeline(tmp_path=None, **kwargs):
+    # A long flush interval and a batch size above capacity keep the writer
+    # idle until close(), so buffer contents are deterministic.
+    options = {"flush_interval": 60, "batch_size": 1000}
+    options.update(kwargs)
+    log_file = str(tmp_path / "server.log") if tmp_path else None
+    return LogPipeline(log_file=log_file, **options)
+
+def read_records(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+def test_level_filtering(tmp_path):
+    pipeline = make_pipeline(tmp_path, level="WARNING")
+    pipeline.log("debug", level="DEBUG")
+    pipeline.log("info")
+    pipeline.log("warning", level="WARNING")
+    pipeline.log("error", level="ERROR", request_id=7)
+    pipeline.close()
+
+    stats = pipeline.stats()
+    assert stats["filtered"] == 2
+    assert stats["written"] == 2
+    records = read_records(pipeline.log_file)
+    assert [r["msg"] for r in records] == ["warning", "error"]
+    assert records[1]["level"] == "ERROR"
+    assert records[1]["request_id"] == 7
+
+def test_unknown_level_defaults_to_info():
+    pipeline = make_pipeline(level="nonsense")
+    pipeline.log("debug", level="DEBUG")
+    pipeline.log("info")
+    assert pipeline.stats()["filtered"] == 1
+    pipeline.close()
+
+def test_overflow_drops_oldest_and_counts(tmp_path):
+    pipeline = make_pipeline(tmp_path, capacity=5)
+    for i in range(8):
+        pipeline.log(f"m{i}")
+    assert pipeline.stats()["dropped"] == 3
+    assert pipeline.stats()["pending"] == 5
+    pipeline.close()
+
+    assert [r["msg"] for r in read_records(pipeline.log_file)] == ["m3", "m4", "m5", "m6", "m7"]
+    assert pipeline.stats()["written"] == 5
+
+def test_tail_since_returns_only_new_lines():
+    pipeline = make_pipeline(tail_size=3)
+    for i in range(5):
+        pipeline.log(f"m{i}")
+
+    seq, lines = pipeline.tail_since(0)
+    assert seq == 5
+    assert [line.split("] ", 1)[1] for line in lines] == ["m2", "m3", "m4"]
+    assert pipeline.tail_since(seq) == (5, [])
+
+    pipeline.log("m5")
+    seq, lines = pipeline.tail_since(seq)
+    assert seq == 6
+    assert len(lines) == 1 and lines[0].endswith("m5")
+    pipeline.close()
+
+def test_rotation_keeps_backup_count(tmp_path):
+    pipeline = make_pipeline(tmp_path, batch_size=1, flush_interval=0.01, max_bytes=100, backup_count=2)
+    for i in range(20):
+        pipeline.log("x" * 50)
+    pipeline.close()
+
+    # server.log itself only reappears on the next write after a rotation
+    files = set(os.listdir(tmp_path))
+    assert {"server.log.1", "server.log.2"} <= files
+    assert files <= {"server.log", "server.log.1", "server.log.2"}
+    stats = pipeline.stats()
+    assert stats["written"] == 20
+    assert stats["dropped"] == 0
+    assert stats["write_errors"] == 0
+
+def test_failed_rotation_is_not_counted_as_dropped(tmp_path, monkeypatch):
+    def fail_replace(src, dst):
+        raise OSError("rename failed")
+    monkeypatch.setattr(log_pipeline.os, "replace", fail_replace)
+
+    pipeline = make_pipeline(tmp_path, batch_size=1, flush_interval=0.01, max_bytes=10, backup_count=2)
+    for i in range(3):
+        pipeline.log(f"m{i}")
+    pipeline.close()
+
+    stats = pipeline.stats()
+    assert stats["written"] == 3
+    assert stats["dropped"] == 0
+    assert stats["write_errors"] >= 1
+    assert [r["msg"] for r in read_records(pipeline.log_file)] == ["m0", "m1", "m2"]
+
+def test_write_failure_counts_batch_as_dropped(tmp_path):
+    # A directory can't be opened for writing
+    pipeline = LogPipeline(log_file=str(tmp_path), flush_interval=60)
+    pipeline.log("lost")
+    pipeline.close()
+
+    stats = pipeline.stats()
+    assert stats["written"] == 0
+    assert stats["dropped"] == 1
+    assert stats["write_errors"] == 1
+
+@pytest.mark.parametrize("log_file", [None, ""])
+def test_without_log_file_records_are_discarded(log_file):
+    pipeline = LogPipeline(log_file=log_file, flush_interval=60)
+    pipeline.log("hello")
+    pipeline.close()
+    assert pipeline.stats()["written"] == 1
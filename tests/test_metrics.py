@@ -0,0 +1,134 @@
+import types
+import pytest
+from core import metrics
+from core.metrics import ServerMetrics
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(metrics, "time", types.SimpleNamespace(monotonic=fake, perf_counter=fake))
+    return fake
+
+def test_request_moves_from_queued_to_active_to_done(clock):
+    m = ServerMetrics()
+    tracker = m.track_request()
+    assert (m.snapshot()["queued"], m.snapshot()["active"]) == (1, 0)
+
+    tracker.started()
+    assert (m.snapshot()["queued"], m.snapshot()["active"]) == (0, 1)
+
+    clock.now += 0.25
+    tracker.finished(completion_tokens=10)
+    snapshot = m.snapshot()
+    assert (snapshot["queued"], snapshot["active"]) == (0, 0)
+    assert snapshot["total_requests"] == 1
+    assert snapshot["total_tokens"] == 10
+    assert snapshot["latency_p50"] == pytest.approx(0.25)
+
+def test_request_finished_while_queued(clock):
+    m = ServerMetrics()
+    tracker = m.track_request()
+    tracker.finished(error=True)
+    snapshot = m.snapshot()
+    assert (snapshot["queued"], snapshot["active"]) == (0, 0)
+    assert snapshot["total_errors"] == 1
+    assert snapshot["latency_p50"] is None
+
+def test_finished_is_idempotent(clock):
+    m = ServerMetrics()
+    tracker = m.track_request()
+    tracker.started()
+    tracker.finished(completion_tokens=5)
+    tracker.finished(error=True)
+    snapshot = m.snapshot()
+    assert snapshot["active"] == 0
+    assert snapshot["total_requests"] == 1
+    assert snapshot["total_errors"] == 0
+
+def test_started_after_finished_is_ignored(clock):
+    # A cancelled request's worker thread may still reach the model afterwards
+    m = ServerMetrics()
+    tracker = m.track_request()
+    tracker.finished(error=True)
+    tracker.started()
+    snapshot = m.snapshot()
+    assert (snapshot["queued"], snapshot["active"]) == (0, 0)
+
+def test_token_rate_window(clock):
+    m = ServerMetrics(window_seconds=10)
+    for tokens in (20, 30):
+        tracker = m.track_request()
+        tracker.started()
+        tracker.finished(completion_tokens=tokens)
+    assert m.snapshot()["tokens_per_second"] == pytest.approx(5.0)
+
+    clock.now += 5
+    tracker = m.track_request()
+    tracker.started()
+    tracker.finished(completion_tokens=50)
+    assert m.snapshot()["tokens_per_second"] == pytest.approx(10.0)
+
+    # The first bucket ages out of the window, the second one stays
+    clock.now += 6
+    assert m.snapshot()["tokens_per_second"] == pytest.approx(5.0)
+
+    clock.now += 100
+    snapshot = m.snapshot()
+    assert snapshot["tokens_per_second"] == 0
+    assert snapshot["total_tokens"] == 100
+
+def test_latency_percentiles_use_bounded_samples(clock):
+    m = ServerMetrics(window_seconds=1000, latency_samples=100)
+    for i in range(1, 201):
+        tracker = m.track_request()
+        tracker.started()
+        clock.now += i / 1000
+        tracker.finished(completion_tokens=1)
+    snapshot = m.snapshot()
+    # Only the last 100 samples (101..200 ms) are kept
+    assert snapshot["latency_p50"] == pytest.approx(0.150, abs=0.001)
+    assert snapshot["latency_p95"] == pytest.approx(0.195, abs=0.001)
+
+def test_latency_percentiles_age_out_with_window(clock):
+    m = ServerMetrics(window_seconds=10)
+    tracker = m.track_request()
+    tracker.started()
+    clock.now += 0.5
+    tracker.finished(completion_tokens=1)
+
+    clock.now += 5
+    tracker = m.track_request()
+    tracker.started()
+    clock.now += 0.1
+    tracker.finished(completion_tokens=1)
+
+    snapshot = m.snapshot()
+    assert snapshot["latency_p95"] == pytest.approx(0.5)
+
+    # Only the second sample is still inside the window
+    clock.now += 6
+    snapshot = m.snapshot()
+    assert snapshot["latency_p50"] == pytest.approx(0.1)
+    assert snapshot["latency_p95"] == pytest.approx(0.1)
+
+    # No traffic for a full window: latency and rate agree that nothing is happening
+    clock.now += 10
+    snapshot = m.snapshot()
+    assert snapshot["latency_p50"] is None
+    assert snapshot["latency_p95"] is None
+    assert snapshot["tokens_per_second"] == 0
+
+def test_cache_hit_rate(clock):
+    m = ServerMetrics()
+    assert m.snapshot()["cache_hit_rate"] is None
+    m.record_cache(True)
+    m.record_cache(True)
+    m.record_cache(False)
+    assert m.snapshot()["cache_hit_rate"] == pytest.approx(2 / 3)
@@ -0,0 +1,108 @@
+from benchmarks.regression import check_against_baseline, compare_reports, config_mismatches, get_metric
+
+CONFIG = {
+    "requests": 200,
+    "concurrency": 8,
+    "arrival": "closed",
+    "rate": None,
+    "prompt_dist": "fixed",
+    "prompt_tokens": 32,
+    "prompt_sigma": None,
+    "max_tokens": 16,
+    "fake_server": True,
+    "token_latency": 0.002,
+    "prompt_token_latency": 0.0001,
+    "seed": 0
+}
+
+def report(throughput=100.0, p95=50.0, error_rate=0.0, **config):
+    return {
+        "config": dict(CONFIG, **config),
+        "throughput_rps": throughput,
+        "latency": {"p50": 20.0, "p95": p95},
+        "error_rate": error_rate
+    }
+
+def by_metric(findings):
+    return {f["metric"]: f for f in findings}
+
+def test_get_metric_dotted_keys():
+    assert get_metric(report(), "latency.p95") == 50.0
+    assert get_metric(report(), "latency.p99") is None
+    assert get_metric({"latency": None}, "latency.p50") is None
+
+def test_identical_reports_have_no_regressions():
+    findings = compare_reports(report(), report())
+    assert findings
+    assert not any(f["regression"] for f in findings)
+
+def test_lower_throughput_is_a_regression():
+    findings = by_metric(compare_reports(report(throughput=80.0), report(throughput=100.0), tolerance=0.10))
+    assert findings["throughput_rps"]["regression"]
+    assert findings["throughput_rps"]["change"] == -0.2
+
+def test_higher_throughput_is_not_a_regression():
+    findings = by_metric(compare_reports(report(throughput=150.0), report(throughput=100.0)))
+    assert not findings["throughput_rps"]["regression"]
+
+def test_higher_latency_is_a_regression():
+    findings = by_metric(compare_reports(report(p95=60.0), report(p95=50.0), tolerance=0.10))
+    assert findings["latency.p95"]["regression"]
+    assert not findings["latency.p50"]["regression"]
+
+def test_lower_latency_is_not_a_regression():
+    findings = by_metric(compare_reports(report(p95=10.0), report(p95=50.0)))
+    assert not findings["latency.p95"]["regression"]
+
+def test_change_within_tolerance_is_not_a_regression():
+    findings = by_metric(compare_reports(report(p95=54.0), report(p95=50.0), tolerance=0.10))
+    assert not findings["latency.p95"]["regression"]
+
+def test_zero_baseline():
+    # Any errors on top of an error-free baseline regress; staying at zero does not
+    findings = by_metric(compare_reports(report(error_rate=0.05), report(error_rate=0.0)))
+    assert findings["error_rate"]["regression"]
+    assert findings["error_rate"]["change"] is None
+
+    findings = by_metric(compare_reports(report(error_rate=0.0), report(error_rate=0.0)))
+    assert not findings["error_rate"]["regression"]
+    assert findings["error_rate"]["change"] == 0.0
+
+def test_zero_baseline_for_higher_is_better_metric():
+    findings = by_metric(compare_reports(report(throughput=10.0), report(throughput=0.0)))
+    assert not findings["throughput_rps"]["regression"]
+
+def test_metrics_missing_on_either_side_are_skipped():
+    findings = by_metric(compare_reports({"throughput_rps": 1.0}, {"latency": {"p95": 1.0}}))
+    assert findings == {}
+
+def test_matching_configs_have_no_mismatches():
+    # requests and seed only change the sample, so they don't block a comparison
+    assert config_mismatches(report(requests=500, seed=3), report()) == []
+
+def test_config_mismatches_are_reported():
+    mismatches = config_mismatches(report(concurrency=1, arrival="poisson", rate=5.0), report())
+    assert {m["key"] for m in mismatches} == {"concurrency", "arrival", "rate"}
+    concurrency = next(m for m in mismatches if m["key"] == "concurrency")
+    assert (concurrency["baseline"], concurrency["current"]) == (8, 1)
+
+def test_missing_config_block_mismatches():
+    baseline = report()
+    del baseline["config"]
+    assert config_mismatches(report(), baseline)
+
+def test_check_against_baseline_refuses_mismatched_config():
+    result, exit_code = check_against_baseline(report(throughput=10.0, concurrency=1), report())
+    assert exit_code == 2
+    assert result["regressions"] is None
+    assert [m["key"] for m in result["config_mismatches"]] == ["concurrency"]
+
+def test_check_against_baseline_can_override_mismatch():
+    result, exit_code = check_against_baseline(report(throughput=10.0, concurrency=1), report(), allow_config_mismatch=True)
+    assert exit_code == 1
+    assert result["config_mismatches"]
+    assert by_metric(result["regressions"])["throughput_rps"]["regression"]
+
+def test_check_against_baseline_exit_codes():
+    assert check_against_baseline(report(), report())[1] == 0
+    assert check_against_baseline(report(p95=80.0), report())[1] == 1
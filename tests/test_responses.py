@@ -0,0 +1,45 @@
+import pytest
+from api import responses
+
+@pytest.fixture(autouse=True)
+def msgpack_available(monkeypatch):
+    # Negotiation is only offered when an encoder exists; don't depend on
+    # whether msgpack/msgspec happen to be installed.
+    monkeypatch.setattr(responses, "dumps_msgpack", lambda content: b"")
+
+@pytest.mark.parametrize("accept, expected", [
+    ("application/msgpack", True),
+    ("application/x-msgpack", True),
+    ("application/vnd.msgpack", True),
+    ("application/json", False),
+    ("*/*", False),
+    (None, False),
+    ("", False),
+    # Higher q-value wins
+    ("application/json;q=0.5, application/msgpack", True),
+    ("application/msgpack;q=0.5, application/json", False),
+    ("application/json;q=0.2, application/msgpack;q=0.9", True),
+    # Ties go to whichever type was listed first
+    ("application/json, application/msgpack", False),
+    ("application/msgpack, application/json", True),
+    # q=0 means "not acceptable"; malformed q counts as 0
+    ("application/msgpack;q=0", False),
+    ("application/msgpack;q=abc, application/json;q=0.1", False),
+    ("APPLICATION/MSGPACK", True),
+])
+def test_wants_msgpack(accept, expected):
+    assert responses.wants_msgpack(accept) is expected
+
+def test_wants_msgpack_without_encoder(monkeypatch):
+    monkeypatch.setattr(responses, "dumps_msgpack", None)
+    assert responses.wants_msgpack("application/msgpack") is False
+
+def test_negotiate_response_picks_class():
+    assert isinstance(responses.negotiate_response("application/msgpack", {}), responses.MsgPackResponse)
+    json_response = responses.negotiate_response("application/json", {"a": 1}, status_code=503)
+    assert isinstance(json_response, responses.FastJSONResponse)
+    assert json_response.status_code == 503
+    assert json_response.media_type == "application/json"
+
+def test_dumps_json_is_compact():
+    assert responses.dumps_json({"a": [1, None], "b": "é"}) == '{"a":[1,null],"b":"é"}'.encode("utf-8")